@@ -23,28 +23,63 @@ import re
 import sys
 import argparse
 import os
+import functools
+from copy import deepcopy
+from io import BytesIO
+from pathlib import Path
 
 from docx import Document
 from docx.shared import Inches, Pt, RGBColor
 from docx.enum.text import WD_ALIGN_PARAGRAPH
-from docx.oxml import OxmlElement
-from docx.oxml.ns import qn
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls, qn
 from docx.opc.constants import RELATIONSHIP_TYPE
 
+# Folder holding header.txt and the prompt files.
+SETTINGS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "settings")
+
+# Regex to classify a stripped line in one match; the matching group name is the line kind.
+_LINE_KIND_RE = re.compile(r'(?P<hr>---$)|(?P<heading>#{1,6}\s)|(?P<table>\|)|(?P<bullet>- )')
+# Word paragraph style for each Markdown heading level; deeper levels use 'Normal'.
+_STYLE_BY_LEVEL = {1: 'Heading1', 2: 'Heading2', 3: 'Heading3'}
+
+# Run properties shared by every run, parsed once and deep-copied per run.
+_APTOS_RPR = parse_xml(
+    '<w:rPr %s><w:rFonts w:ascii="Aptos" w:hAnsi="Aptos"/></w:rPr>' % nsdecls('w')
+)
+# Hyperlink holding a single underlined, Aptos-font run; r:id and text are set per copy.
+_HYPERLINK = parse_xml(
+    '<w:hyperlink %s><w:r><w:rPr><w:u w:val="single"/>'
+    '<w:rFonts w:ascii="Aptos" w:hAnsi="Aptos"/></w:rPr></w:r></w:hyperlink>' % nsdecls('w', 'r')
+)
+# Paragraph bottom border used for horizontal rules.
+_HR_PBDR = parse_xml(
+    '<w:pBdr %s><w:bottom w:val="single" w:sz="6" w:space="1" w:color="auto"/></w:pBdr>' % nsdecls('w')
+)
+
+# Cell shading for the Certifications table.
+_SHD_XML = '<w:shd %s w:fill="%%s"/>' % nsdecls('w')
+_SHD_GREEN = parse_xml(_SHD_XML % "C6EFCE")   # Pastel green.
+_SHD_YELLOW = parse_xml(_SHD_XML % "FFFACD")  # Pastel yellow.
+
 # -------------------------------
 # Helper functions
 # -------------------------------
 
-def set_cell_background(cell, color_hex):
+@functools.lru_cache(maxsize=4)
+def load_setting(name):
+    """
+    Return the contents of a file in the settings folder (e.g. "header.txt").
+    The result is cached, so each file is read from disk at most once per process.
+    """
+    with open(os.path.join(SETTINGS_DIR, name), 'r', encoding='utf-8') as f:
+        return f.read()
+
+def _set_shd(cell, shd):
     """
-    Set the background shading of a cell.
-    color_hex: a string like "FFFACD" (no '#' character).
+    Append a copy of a pre-parsed w:shd element (e.g. _SHD_GREEN) to the cell.
     """
-    tc = cell._tc
-    tcPr = tc.get_or_add_tcPr()
-    shd = OxmlElement('w:shd')
-    shd.set(qn('w:fill'), color_hex)
-    tcPr.append(shd)
+    cell._tc.get_or_add_tcPr().append(deepcopy(shd))
 
 def add_hyperlink(paragraph, text, url):
     """
@@ -54,29 +89,66 @@ def add_hyperlink(paragraph, text, url):
     part = paragraph.part
     r_id = part.relate_to(url, RELATIONSHIP_TYPE.HYPERLINK, is_external=True)
     
-    # Create the hyperlink element.
-    hyperlink = OxmlElement('w:hyperlink')
+    # Copy the hyperlink skeleton and fill in the relationship id and link text.
+    hyperlink = deepcopy(_HYPERLINK)
     hyperlink.set(qn('r:id'), r_id)
-    
-    # Create a run for the link text.
-    new_run = OxmlElement('w:r')
-    rPr = OxmlElement('w:rPr')
-    # Underline the text.
-    u = OxmlElement('w:u')
-    u.set(qn('w:val'), 'single')
-    rPr.append(u)
-    # Set the font to Aptos.
-    rFonts = OxmlElement('w:rFonts')
-    rFonts.set(qn('w:ascii'), "Aptos")
-    rFonts.set(qn('w:hAnsi'), "Aptos")
-    rPr.append(rFonts)
-    
-    new_run.append(rPr)
-    new_run.text = text
-    hyperlink.append(new_run)
+    hyperlink[0].text = text
     paragraph._p.append(hyperlink)
     return hyperlink
 
+def _tokenize_inline(markdown_text):
+    """
+    Split markdown_text into a list of inline tokens in a single left-to-right pass:
+      - ("text", chunk)
+      - ("bold", inner)        for **inner**
+      - ("italic", inner)      for *inner*
+      - ("link", text, url)    for [text](url)
+    Bold and italic spans do not cross line breaks; unmatched markers are kept as text.
+    """
+    # Most lines have no markers at all; skip the scan for them.
+    if '*' not in markdown_text and '[' not in markdown_text:
+        return [("text", markdown_text)] if markdown_text else []
+    tokens = []
+    n = len(markdown_text)
+    pos = 0  # Start of the pending plain text.
+    i = 0
+    while i < n:
+        c = markdown_text[i]
+        token = None
+        end = -1
+        if c == '*':
+            # Bold: "**" followed by at least one character and a closing "**".
+            if markdown_text.startswith('*', i + 1):
+                close = markdown_text.find('**', i + 3)
+                if close != -1 and '\n' not in markdown_text[i + 2:close]:
+                    token = ("bold", markdown_text[i + 2:close])
+                    end = close + 2
+            # Italic: "*" followed by at least one character and a closing "*".
+            if token is None:
+                close = markdown_text.find('*', i + 2)
+                if close != -1 and '\n' not in markdown_text[i + 1:close]:
+                    token = ("italic", markdown_text[i + 1:close])
+                    end = close + 1
+        elif c == '[':
+            # Link: "[text](url)" with non-empty text and url.
+            close = markdown_text.find(']', i + 1)
+            if close > i + 1 and markdown_text.startswith('(', close + 1):
+                url_end = markdown_text.find(')', close + 2)
+                if url_end > close + 2:
+                    token = ("link", markdown_text[i + 1:close], markdown_text[close + 2:url_end])
+                    end = url_end + 1
+        if token is None:
+            i += 1
+            continue
+        # Add any text before the match.
+        if i > pos:
+            tokens.append(("text", markdown_text[pos:i]))
+        tokens.append(token)
+        pos = i = end
+    if pos < n:
+        tokens.append(("text", markdown_text[pos:]))
+    return tokens
+
 def insert_markdown_text(paragraph, markdown_text):
     """
     Parse the markdown_text and add runs to the given paragraph.
@@ -86,34 +158,20 @@ def insert_markdown_text(paragraph, markdown_text):
       - Hyperlinks: [link text](url)
     All text uses the Aptos font.
     """
-    # Regex to match either **bold**, *italic*, or [link text](url)
-    pattern = re.compile(r"(\*\*(?P<bold>.+?)\*\*|\*(?P<italic>.+?)\*|\[(?P<link_text>[^\]]+)\]\((?P<link_url>[^)]+)\))")
-    pos = 0
-    for match in pattern.finditer(markdown_text):
-        # Add any text before the match.
-        if match.start() > pos:
-            run = paragraph.add_run(markdown_text[pos:match.start()])
-            run.font.name = "Aptos"
-        if match.group('bold'):
-            run = paragraph.add_run(match.group('bold'))
+    for token in _tokenize_inline(markdown_text):
+        kind = token[0]
+        if kind == "link":
+            add_hyperlink(paragraph, token[1], token[2])
+            continue
+        run = paragraph.add_run(token[1])
+        run._r.insert(0, deepcopy(_APTOS_RPR))
+        if kind == "bold":
             run.bold = True
-            run.font.name = "Aptos"
-        elif match.group('italic'):
-            run = paragraph.add_run(match.group('italic'))
+        elif kind == "italic":
             run.italic = True
-            run.font.name = "Aptos"
-        elif match.group('link_text'):
-            add_hyperlink(paragraph, match.group('link_text'), match.group('link_url'))
-        pos = match.end()
-    if pos < len(markdown_text):
-        run = paragraph.add_run(markdown_text[pos:])
-        run.font.name = "Aptos"
-
-def insert_formatted_text(paragraph, text):
-    """
-    Convenience function to insert markdown-formatted text into a paragraph.
-    """
-    insert_markdown_text(paragraph, text)
+
+# Kept as an alias for existing callers; call sites use insert_markdown_text directly.
+insert_formatted_text = insert_markdown_text
 
 def add_paragraph_with_formatting(doc, text, style=None, alignment=None):
     """
@@ -122,7 +180,7 @@ def add_paragraph_with_formatting(doc, text, style=None, alignment=None):
     p = doc.add_paragraph(style=style)
     if alignment is not None:
         p.alignment = alignment
-    insert_formatted_text(p, text)
+    insert_markdown_text(p, text)
     return p
 
 def add_horizontal_line(doc):
@@ -132,66 +190,47 @@ def add_horizontal_line(doc):
     p = doc.add_paragraph()
     p.paragraph_format.space_before = Pt(0)
     p.paragraph_format.space_after = Pt(0)
-    p_pr = p._p.get_or_add_pPr()
-    p_bdr = OxmlElement("w:pBdr")
-    bottom = OxmlElement("w:bottom")
-    bottom.set(qn("w:val"), "single")
-    bottom.set(qn("w:sz"), "6")
-    bottom.set(qn("w:space"), "1")
-    bottom.set(qn("w:color"), "auto")
-    p_bdr.append(bottom)
-    p_pr.append(p_bdr)
-
-def try_process_heading(doc, line, header_block=False):
+    p._p.get_or_add_pPr().append(deepcopy(_HR_PBDR))
+
+def classify_line(line):
     """
-    If the line is a Markdown heading (one or more '#' followed by a space), add a
-    corresponding Word heading paragraph.
-    
-    header_block: if True, center the paragraph (used for the top block).
-    
-    Returns a tuple (is_heading, level, text) where:
-      - is_heading: True if the line was processed as a heading.
-      - level: the heading level (1 to 6) if processed.
-      - text: the heading text.
+    Classify a single Markdown line so it only has to be inspected once.
+
+    Returns a tuple (kind, stripped, heading) where:
+      - kind: one of "hr", "heading", "table", "bullet" or "text".
+      - stripped: the line with surrounding whitespace removed.
+      - heading: (level, text) for headings, otherwise None.
     """
-    m = re.match(r'^(#{1,6})\s+(.*)$', line)
-    if m:
-        level = len(m.group(1))
-        text = m.group(2).strip()
-        if level == 1:
-            style = 'Heading1'
-        elif level == 2:
-            style = 'Heading2'
-        elif level == 3:
-            style = 'Heading3'
-        else:
-            style = 'Normal'
-        p = doc.add_paragraph(style=style)
-        if header_block:
-            p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        insert_formatted_text(p, text)
-        return True, level, text
-    return False, None, None
+    stripped = line.strip()
+    m = _LINE_KIND_RE.match(stripped)
+    if m is None:
+        return "text", stripped, None
+    kind = m.lastgroup
+    if kind == "heading":
+        # The match ends just after the whitespace following the '#' run.
+        level = m.end() - 1
+        return kind, stripped, (level, stripped[m.end():].strip())
+    return kind, stripped, None
 
 def add_job_block_to_doc(doc, block_lines):
     """
     Add a block of lines (for an employment/job entry) to the document.
     Sets "keep with next" on all paragraphs except the last to help keep them together on one page.
     """
-    paragraphs = []
+    prev = None
     for line in block_lines:
         line = line.strip()
         if not line:
             continue
+        # Each paragraph that gets a successor is kept with it; the last one never is.
+        if prev is not None:
+            prev.paragraph_format.keep_with_next = True
         if line.startswith("- "):
-            p = doc.add_paragraph(style='List Bullet')
-            insert_formatted_text(p, line[2:].strip())
+            prev = doc.add_paragraph(style='List Bullet')
+            insert_markdown_text(prev, line[2:].strip())
         else:
-            p = doc.add_paragraph()
-            insert_formatted_text(p, line)
-        paragraphs.append(p)
-    for p in paragraphs[:-1]:
-        p.paragraph_format.keep_with_next = True
+            prev = doc.add_paragraph()
+            insert_markdown_text(prev, line)
 
 def add_table_to_doc(doc, table_lines):
     """
@@ -208,16 +247,19 @@ def add_table_to_doc(doc, table_lines):
     # Data rows: skip the separator (second line) and process the rest.
     data_lines = table_lines[2:]
     
-    table = doc.add_table(rows=len(data_lines) + 1, cols=len(header_cells_text))
+    ncols = len(header_cells_text)
+    table = doc.add_table(rows=len(data_lines) + 1, cols=ncols)
     table.style = 'Table Grid'
+    # Fetch the cell grid once; Row.cells rebuilds it on every access.
+    all_cells = table._cells
 
     # Header row formatting.
-    hdr_cells = table.rows[0].cells
+    hdr_cells = all_cells[:ncols]
     for j, text in enumerate(header_cells_text):
         p = hdr_cells[j].paragraphs[0]
         p.text = ""
-        insert_formatted_text(p, text)
-        set_cell_background(hdr_cells[j], "C6EFCE")  # Pastel green.
+        insert_markdown_text(p, text)
+        _set_shd(hdr_cells[j], _SHD_GREEN)
         for paragraph in hdr_cells[j].paragraphs:
             for run in paragraph.runs:
                 run.font.color.rgb = RGBColor(0x00, 0x61, 0x00)  # Dark green.
@@ -226,54 +268,97 @@ def add_table_to_doc(doc, table_lines):
     # Data rows: Apply pastel yellow background to every cell.
     for i, line in enumerate(data_lines):
         cells = [cell.strip() for cell in line.strip("|").split("|")]
-        row_cells = table.rows[i+1].cells
+        row_cells = all_cells[(i+1)*ncols:(i+2)*ncols]
         for j, text in enumerate(cells):
             p = row_cells[j].paragraphs[0]
             p.text = ""
-            insert_formatted_text(p, text)
-            set_cell_background(row_cells[j], "FFFACD")  # Pastel yellow.
+            insert_markdown_text(p, text)
+            _set_shd(row_cells[j], _SHD_YELLOW)
             for paragraph in row_cells[j].paragraphs:
                 for run in paragraph.runs:
                     run.font.color.rgb = RGBColor(0, 0, 0)  # Black text.
                     run.font.name = "Aptos"
 
 # -------------------------------
-# Main conversion function
+# Line handlers for the main body
 # -------------------------------
 
-def convert_md_to_docx(md_file, docx_file, output_path=None):
-    # Determine the output file location.
-    if output_path:
-        # If the path is not absolute, make it absolute relative to the current working directory.
-        if not os.path.isabs(output_path):
-            output_path = os.path.abspath(output_path)
-        # Create the folder if it doesn't exist.
-        if not os.path.exists(output_path):
-            os.makedirs(output_path)
-        # Place the output file in the specified folder.
-        docx_file = os.path.join(output_path, os.path.basename(docx_file))
+class ConversionState:
+    """
+    Mutable state shared by the line handlers while rendering the main body.
+    """
+    def __init__(self):
+        self.in_employment = False  # Flag to indicate we're inside the EMPLOYMENT HISTORY block.
+        self.job_block = []         # Collect lines belonging to a single job block.
+        self.table_lines = []       # Collect lines of a table.
+
+def flush_job_block(doc, state):
+    """
+    Add any collected job block lines to the document and reset the block.
+    """
+    if state.job_block:
+        add_job_block_to_doc(doc, state.job_block)
+        state.job_block = []
+
+def flush_table(doc, state):
+    """
+    Add any collected table lines to the document and reset the table.
+    """
+    if state.table_lines:
+        add_table_to_doc(doc, state.table_lines)
+        state.table_lines = []
+
+def _handle_hr(doc, state, line, stripped, heading):
+    # Render horizontal rules.
+    flush_job_block(doc, state)
+    add_horizontal_line(doc)
+
+def _handle_heading(doc, state, line, stripped, heading):
+    level, heading_text = heading
+    add_paragraph_with_formatting(doc, heading_text, style=_STYLE_BY_LEVEL.get(level, 'Normal'))
+    # If we were inside an employment block, flush it.
+    flush_job_block(doc, state)
+    # If this is a level‑2 heading and its text is "EMPLOYMENT HISTORY", set the flag.
+    state.in_employment = level == 2 and heading_text.upper() == "EMPLOYMENT HISTORY"
+
+def _handle_table(doc, state, line, stripped, heading):
+    # Lines starting with "|" are part of a table; it is flushed by the first non-table line.
+    state.table_lines.append(line)
+
+def _handle_bullet(doc, state, line, stripped, heading):
+    if state.in_employment:
+        state.job_block.append(line)
     else:
-        # If no output path is provided and no directory is specified in the docx_file, 
-        # default to the exported_resumes folder.
-        if not os.path.dirname(docx_file):
-            exported_folder = os.path.join(os.path.dirname(__file__), "exported_resumes")
-            if not os.path.exists(exported_folder):
-                os.makedirs(exported_folder)
-            docx_file = os.path.join(exported_folder, docx_file)
-        else:
-            docx_file = os.path.abspath(docx_file)
+        p = doc.add_paragraph(style='List Bullet')
+        insert_markdown_text(p, stripped[2:].strip())
 
-    with open(md_file, 'r', encoding='utf-8') as f:
-        md_text = f.read()
+def _handle_text(doc, state, line, stripped, heading):
+    if state.in_employment:
+        state.job_block.append(line)
+    else:
+        p = doc.add_paragraph()
+        insert_markdown_text(p, line)
+
+# Line kind (as returned by classify_line) -> handler.
+_HANDLERS = {
+    "hr": _handle_hr,
+    "heading": _handle_heading,
+    "table": _handle_table,
+    "bullet": _handle_bullet,
+    "text": _handle_text,
+}
 
-    # Remove code fence markers if present at the top and bottom.
-    lines = md_text.splitlines()
-    if lines and lines[0].strip() == "```markdown":
-        lines = lines[1:]
-    if lines and lines[-1].strip() == "```":
-        lines = lines[:-1]
-    md_text = "\n".join(lines)
+# -------------------------------
+# Main conversion function
+# -------------------------------
 
+@functools.lru_cache(maxsize=1)
+def _template_bytes():
+    """
+    Build an empty document with the page size, margins, default style and page
+    header already applied, and return it serialized as .docx bytes.
+    Built once per process; each conversion opens a fresh copy of it.
+    """
     doc = Document()
 
     # Set page dimensions and margins.
@@ -298,10 +383,9 @@ def convert_md_to_docx(md_file, docx_file, output_path=None):
     # -------------------------------
     # Read header text from header.txt file.
     # -------------------------------
-    header_path = os.path.join(os.path.dirname(__file__), "settings", "header.txt")
+    header_path = os.path.join(SETTINGS_DIR, "header.txt")
     try:
-        with open(header_path, 'r', encoding='utf-8') as hf:
-            header_text = hf.read().strip()
+        header_text = load_setting("header.txt").strip()
     except Exception as e:
         sys.exit(f"Error reading header file at {header_path}: {e}")
 
@@ -315,98 +399,81 @@ def convert_md_to_docx(md_file, docx_file, output_path=None):
     insert_markdown_text(hp, header_text)
     hp.alignment = WD_ALIGN_PARAGRAPH.CENTER
 
-    # Split Markdown into lines.
-    lines = md_text.splitlines()
-    i = 0
+    buf = BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
 
-    # Process the top header block (everything until the first horizontal rule).
-    header_block_lines = []
-    while i < len(lines) and lines[i].strip() != "---":
-        header_block_lines.append(lines[i])
-        i += 1
-
-    # Process header block lines.
-    for line in header_block_lines:
-        stripped = line.strip()
-        if not stripped:
-            continue
-        is_heading, level, text = try_process_heading(doc, stripped, header_block=True)
-        if not is_heading:
-            p = doc.add_paragraph()
-            p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-            insert_formatted_text(p, stripped)
-
-    # Process any horizontal rule(s) in the header block.
-    while i < len(lines) and lines[i].strip() == "---":
-        add_horizontal_line(doc)
-        i += 1
-
-    # Process the remaining content.
-    in_employment = False  # Flag to indicate we're inside the EMPLOYMENT HISTORY block.
-    current_job_block = []  # Collect lines belonging to a single job block.
-    table_lines = []        # Collect lines of a table.
-
-    while i < len(lines):
-        line = lines[i]
-        stripped = line.strip()
-
-        # Render horizontal rules.
-        if stripped == "---":
-            if in_employment and current_job_block:
-                add_job_block_to_doc(doc, current_job_block)
-                current_job_block = []
-            add_horizontal_line(doc)
-            i += 1
-            continue
+def convert_md_to_docx(md_file, docx_file, output_path=None, quiet=False):
+    """
+    Convert the Markdown resume `md_file` to a DOCX file and return the path it was saved to.
+    quiet: if True, don't print the saved path (callers that report it themselves).
+    """
+    # Determine the output file location.
+    if output_path:
+        # If the path is not absolute, make it absolute relative to the current working directory.
+        output_dir = Path(output_path)
+        if not output_dir.is_absolute():
+            output_dir = Path(os.path.abspath(output_dir))
+        # Create the folder if it doesn't exist.
+        output_dir.mkdir(parents=True, exist_ok=True)
+        # Place the output file in the specified folder.
+        docx_file = str(output_dir / Path(docx_file).name)
+    else:
+        # If no output path is provided and no directory is specified in the docx_file, 
+        # default to the exported_resumes folder.
+        if not os.path.dirname(docx_file):
+            exported_folder = Path(__file__).resolve().parent / "exported_resumes"
+            exported_folder.mkdir(parents=True, exist_ok=True)
+            docx_file = str(exported_folder / docx_file)
+        else:
+            docx_file = os.path.abspath(docx_file)
 
-        # Check if the line is a Markdown heading.
-        is_heading, level, heading_text = try_process_heading(doc, stripped, header_block=False)
-        if is_heading:
-            # If we were inside an employment block, flush it.
-            if in_employment and current_job_block:
-                add_job_block_to_doc(doc, current_job_block)
-                current_job_block = []
-            # If this is a level‑2 heading and its text is "EMPLOYMENT HISTORY", set the flag.
-            if level == 2 and heading_text.upper() == "EMPLOYMENT HISTORY":
-                in_employment = True
-            else:
-                in_employment = False
-            i += 1
-            continue
+    with open(md_file, 'r', encoding='utf-8') as f:
+        lines = f.read().splitlines()
 
-        # Check for table lines (assume lines starting with "|" are part of a table).
-        if stripped.startswith("|"):
-            table_lines.append(line)
-            # If the next line isn’t part of the table, flush the table.
-            if i + 1 < len(lines) and not lines[i+1].strip().startswith("|"):
-                add_table_to_doc(doc, table_lines)
-                table_lines = []
-            elif i + 1 == len(lines):
-                add_table_to_doc(doc, table_lines)
-                table_lines = []
-            i += 1
-            continue
+    # Remove code fence markers if present at the top and bottom, then drop a
+    # single trailing empty line.
+    if lines and lines[0].strip() == "```markdown":
+        del lines[0]
+    if lines and lines[-1].strip() == "```":
+        lines.pop()
+    if lines and lines[-1] == "":
+        lines.pop()
+
+    # Start from the pre-configured page setup, styles and header.
+    doc = Document(BytesIO(_template_bytes()))
 
-        # Process normal text lines.
-        if in_employment:
-            current_job_block.append(line)
+    # Classify each line once, then split at the first horizontal rule.
+    classified = [classify_line(line) for line in lines]
+    kinds = [entry[0] for entry in classified]
+    hr_idx = kinds.index("hr") if "hr" in kinds else len(lines)
+
+    # Process the top header block (everything until the first horizontal rule).
+    for kind, stripped, heading in classified[:hr_idx]:
+        if not stripped:
+            continue
+        if kind == "heading":
+            level, text = heading
+            style = _STYLE_BY_LEVEL.get(level, 'Normal')
         else:
-            if stripped.startswith("- "):
-                p = doc.add_paragraph(style='List Bullet')
-                insert_formatted_text(p, stripped[2:].strip())
-            else:
-                p = doc.add_paragraph()
-                insert_formatted_text(p, line)
-        i += 1
+            text, style = stripped, None
+        add_paragraph_with_formatting(doc, text, style=style, alignment=WD_ALIGN_PARAGRAPH.CENTER)
+
+    # Process the remaining content, starting with the rule(s) closing the header block.
+    state = ConversionState()
+    for line, (kind, stripped, heading) in zip(lines[hr_idx:], classified[hr_idx:]):
+        if kind != "table":
+            flush_table(doc, state)
+        _HANDLERS[kind](doc, state, line, stripped, heading)
 
     # Flush any remaining job block or table.
-    if current_job_block:
-        add_job_block_to_doc(doc, current_job_block)
-    if table_lines:
-        add_table_to_doc(doc, table_lines)
+    flush_job_block(doc, state)
+    flush_table(doc, state)
 
     doc.save(docx_file)
-    print(f"Saved formatted resume to {docx_file}")
+    if not quiet:
+        print(f"Saved formatted resume to {docx_file}")
+    return docx_file
 
 # -------------------------------
 # Command-line interface
@@ -17,7 +17,7 @@ This script:
          * If true, favor the baseline resume—make only minimal changes to align with the role while preserving original wording, job dates (including "Current" and duration details), and proficiency levels.
          * If false, allow creative modifications (except that employment dates and durations must remain exactly as in the baseline).
   4. Saves the tailored resume to a Markdown file with a user‑specified output name.
-  5. Calls convert_resume.py to convert the tailored Markdown resume into a DOCX file with a user‑specified output name.
+  5. Uses convert_resume.py (imported in-process) to convert the tailored Markdown resume into a DOCX file with a user‑specified output name.
   6. **Verbose mode:** If set, print full job details and the prompt sent to OpenAI; if not set, only minimal status messages are shown.
 
   python tailor_and_convert.py \
@@ -30,50 +30,139 @@ This script:
   --verbose \
   --path "exported_resumes"
 
+  Batch mode tailors the resume to every URL listed in a text file (one per line),
+  running up to --workers jobs at the same time:
+
+  python tailor_and_convert.py \
+  --batch "jobs.txt" \
+  --resume "markdown_resumes/resume.dummy.md" \
+  --workers 4
+
 """
 
 import argparse
+import html
 import os
+import re
 import sys
 import shutil
-import subprocess
+import threading
+import traceback
 import requests
-from bs4 import BeautifulSoup
 from dotenv import load_dotenv
 import datetime
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from convert_resume import SETTINGS_DIR, convert_md_to_docx, load_setting
 
 # Load environment variables from .env file.
 load_dotenv()
 
+# Regexes used to extract visible text from a job listing page. None of them can
+# run past the next '<', so untrusted pages are processed in linear time.
+_BLOCK_OPEN_RE = re.compile(r'<!--|<(script|style)\b[^<>]*>', re.IGNORECASE)
+_BLOCK_CLOSE_RE = {
+    "script": re.compile(r'</script\s*>', re.IGNORECASE),
+    "style": re.compile(r'</style\s*>', re.IGNORECASE),
+}
+_TAG_RE = re.compile(r'<[^<>]+>')
+
+_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/90.0.4430.93 Safari/537.36"
+    )
+}
+# Per-thread state: each batch worker keeps its own HTTP session and log prefix.
+_local = threading.local()
+_print_lock = threading.Lock()
+# Seconds to wait for the job listing server before giving up.
+FETCH_TIMEOUT = 15
+
 # -------------------------------
 # Helper functions
 # -------------------------------
 
+def _get_session():
+    """
+    Return this thread's requests.Session, creating it on first use.
+    requests does not guarantee that a Session is thread-safe, so each batch
+    worker gets its own; jobs run by the same worker still reuse its connections.
+    """
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        session.headers.update(_HEADERS)
+        _local.session = session
+    return session
+
+def log(*values):
+    """
+    Print like print(), prefixing every line with the current job's label when
+    one is set (batch mode). Output is written under a lock so that lines from
+    parallel jobs never interleave.
+    """
+    message = " ".join(str(value) for value in values)
+    prefix = getattr(_local, "prefix", "")
+    if prefix:
+        message = "\n".join(prefix + line for line in message.split("\n"))
+    with _print_lock:
+        print(message)
+
+def ensure_folder(folder):
+    """
+    Create `folder` (and any missing parents) if it does not exist yet.
+    Returns True if the folder was created by this call.
+    """
+    try:
+        Path(folder).mkdir(parents=True)
+    except FileExistsError:
+        return False
+    return True
+
+def strip_hidden_blocks(page):
+    """
+    Remove HTML comments and <script>/<style> blocks from `page` in one forward pass.
+    Each block's closing marker is searched for once; an unclosed block runs to
+    the end of the page (as in a browser), so nothing is scanned twice.
+    """
+    parts = []
+    pos = 0
+    while True:
+        m = _BLOCK_OPEN_RE.search(page, pos)
+        if m is None:
+            parts.append(page[pos:])
+            break
+        parts.append(page[pos:m.start()])
+        if m.group(1) is None:
+            end = page.find('-->', m.end())
+            if end == -1:
+                break
+            pos = end + 3
+        else:
+            close = _BLOCK_CLOSE_RE[m.group(1).lower()].search(page, m.end())
+            if close is None:
+                break
+            pos = close.end()
+    return "".join(parts)
+
 def fetch_job_details(url):
     """
     Fetch the job listing webpage at `url` and extract its text content.
     Returns a cleaned-up string with the job details.
     """
-    headers = {
-        "User-Agent": (
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/90.0.4430.93 Safari/537.36"
-        )
-    }
-    response = requests.get(url, headers=headers)
+    response = _get_session().get(url, timeout=FETCH_TIMEOUT)
     if response.status_code != 200:
         raise Exception(f"Failed to fetch URL {url}. Status code: {response.status_code}")
     
-    html = response.text
-    soup = BeautifulSoup(html, "html.parser")
-    # Remove scripts and styles.
-    for element in soup(["script", "style"]):
-        element.decompose()
-    # Get text and remove extra whitespace.
-    text = soup.get_text(separator="\n")
-    lines = [line.strip() for line in text.splitlines()]
+    page = response.text
+    # Remove comments, scripts and styles, then put each remaining tag on its own line.
+    text = _TAG_RE.sub('\n', strip_hidden_blocks(page))
+    # Decode entities, strip every line and drop blank lines.
+    lines = (line.strip() for line in html.unescape(text).splitlines())
     clean_text = "\n".join(line for line in lines if line)
     return clean_text
 
@@ -95,22 +184,20 @@ def tailor_resume(resume_md, job_details, moderate, model="o1-mini", verbose=Fal
     current_date = datetime.datetime.now().strftime("%Y-%m-%d")
     
     # Read header from settings/header.txt
-    header_path = os.path.join("settings", "header.txt")
+    header_path = os.path.join(SETTINGS_DIR, "header.txt")
     try:
-        with open(header_path, "r", encoding="utf-8") as f:
-            header = f.read()
+        header = load_setting("header.txt")
     except Exception as e:
-        print(f"Error reading header file at {header_path}:", e)
+        log(f"Error reading header file at {header_path}:", e)
         sys.exit(1)
     
     # Read instructions from the appropriate prompt file.
     prompt_filename = "moderate.txt" if moderate else "unmoderated.txt"
-    prompt_path = os.path.join("settings", prompt_filename)
+    prompt_path = os.path.join(SETTINGS_DIR, prompt_filename)
     try:
-        with open(prompt_path, "r", encoding="utf-8") as f:
-            instructions = f.read()
+        instructions = load_setting(prompt_filename)
     except Exception as e:
-        print(f"Error reading prompt file at {prompt_path}:", e)
+        log(f"Error reading prompt file at {prompt_path}:", e)
         sys.exit(1)
     
     prompt = (
@@ -127,9 +214,9 @@ def tailor_resume(resume_md, job_details, moderate, model="o1-mini", verbose=Fal
     )
     
     if verbose:
-        print("\n--- FULL PROMPT TO OPENAI ---")
-        print(prompt)
-        print("-----------------------------\n")
+        log("\n--- FULL PROMPT TO OPENAI ---")
+        log(prompt)
+        log("-----------------------------\n")
     
     # For o1-mini, omit the system message (unsupported).
     if model.lower() == "o1-mini":
@@ -154,9 +241,95 @@ def tailor_resume(resume_md, job_details, moderate, model="o1-mini", verbose=Fal
         tailored_resume = response.choices[0].message.content.strip()
         return tailored_resume
     except Exception as e:
-        print("Error calling OpenAI API:", e)
+        log("Error calling OpenAI API:", e)
         sys.exit(1)
 
+def tailor_one(job_url, resume_md, args, label=None):
+    """
+    Tailor `resume_md` to the job listing at `job_url`, save it as Markdown and
+    convert it to DOCX, using the options in the parsed command-line `args`.
+    If `label` is given, every status line is prefixed with it.
+
+    Returns a tuple (output_md, output_docx) with the paths that were written.
+    `args` is only read, so several jobs can run in parallel threads.
+    """
+    _local.prefix = f"[{label}] " if label else ""
+    moderate = (args.moderate.lower() == "true")
+    verbose = args.verbose
+
+    # -------------------------------
+    # Determine output Markdown file name and location
+    # -------------------------------
+    output_md = args.output_md
+    if not output_md:
+        output_md = f"resume_{uuid.uuid4().hex[:8]}.md"
+    
+    if not os.path.dirname(output_md):
+        markdown_folder = "markdown_resumes"
+        if ensure_folder(markdown_folder) and verbose:
+            log(f"Created markdown folder: {markdown_folder}")
+        output_md = os.path.join(markdown_folder, output_md)
+    
+    # -------------------------------
+    # Determine output DOCX file name and location
+    # -------------------------------
+    output_docx = args.output_docx
+    if not output_docx:
+        output_docx = f"docx_resume_{uuid.uuid4().hex[:8]}.docx"
+    
+    if not os.path.dirname(output_docx):
+        exported_folder = "exported_resumes"
+        if ensure_folder(exported_folder) and verbose:
+            log(f"Created exported folder: {exported_folder}")
+        output_docx = os.path.join(exported_folder, output_docx)
+    
+    # Fetch job details from the provided URL.
+    if verbose:
+        log("Fetching job details from the URL...")
+    try:
+        job_details = fetch_job_details(job_url)
+    except Exception as e:
+        log("Error fetching job details:", e)
+        sys.exit(1)
+    if verbose:
+        log("Job details fetched successfully.")
+        log("\n--- JOB DETAILS ---")
+        log(job_details)
+        log("-------------------\n")
+    else:
+        log("Job details fetched successfully.")
+    
+    # Tailor the resume using OpenAI's API.
+    log("Tailoring the resume to match the job listing...")
+    tailored_resume = tailor_resume(resume_md, job_details, moderate, model=args.model, verbose=verbose)
+    log("Resume tailored successfully.")
+    
+    # Save the tailored resume to the specified Markdown file.
+    try:
+        with open(output_md, "w", encoding="utf-8") as f:
+            f.write(tailored_resume)
+        if verbose:
+            log(f"Tailored resume saved as {output_md}")
+        else:
+            log("Tailored resume saved.")
+    except Exception as e:
+        log("Error writing tailored resume:", e)
+        sys.exit(1)
+    
+    # Convert the tailored Markdown resume to DOCX using convert_resume.py.
+    log("Converting the tailored resume to DOCX...")
+    try:
+        output_docx = convert_md_to_docx(output_md, output_docx, args.path, quiet=True)
+        if verbose:
+            log(f"Conversion successful. DOCX saved as {output_docx}")
+        else:
+            log("Conversion successful.")
+    except Exception as e:
+        log("Error during conversion:", e)
+        sys.exit(1)
+    
+    return output_md, output_docx
+
 # -------------------------------
 # Main function
 # -------------------------------
@@ -165,10 +338,16 @@ def main():
     parser = argparse.ArgumentParser(
         description="Tailor a Markdown resume to a job listing and convert it to DOCX."
     )
-    parser.add_argument(
-        "--job_url", required=True,
+    job_source = parser.add_mutually_exclusive_group(required=True)
+    job_source.add_argument(
+        "--job_url",
         help="URL of the job listing"
     )
+    job_source.add_argument(
+        "--batch", default=None,
+        help="Path to a text file with one job listing URL per line (blank lines and lines starting with '#' are ignored). "
+             "The jobs are tailored and converted in parallel, each with randomly named output files."
+    )
     parser.add_argument(
         "--resume", required=True,
         help="Path to the original Markdown resume file"
@@ -193,6 +372,11 @@ def main():
         "--verbose", action="store_true",
         help="Enable verbose mode to show full job details and prompt; default is false."
     )
+    parser.add_argument(
+        "--workers", type=int, default=8,
+        help="Number of jobs processed at the same time in --batch mode (default 8). "
+             "Lower it if you hit OpenAI rate limits."
+    )
     # New argument to pass the output folder for the DOCX file.
     parser.add_argument(
         "--path", type=str, default=None,
@@ -201,52 +385,30 @@ def main():
     )
     
     args = parser.parse_args()
-    moderate = (args.moderate.lower() == "true")
+    if args.batch and (args.output_md or args.output_docx):
+        parser.error("--output_md and --output_docx cannot be used with --batch")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
     verbose = args.verbose
 
-    # -------------------------------
-    # Determine output Markdown file name and location
-    # -------------------------------
-    if not args.output_md:
-        args.output_md = f"resume_{uuid.uuid4().hex[:8]}.md"
-    
-    if not os.path.dirname(args.output_md):
-        markdown_folder = "markdown_resumes"
-        if not os.path.exists(markdown_folder):
-            os.makedirs(markdown_folder)
-            if verbose:
-                print(f"Created markdown folder: {markdown_folder}")
-        args.output_md = os.path.join(markdown_folder, args.output_md)
-    
-    # -------------------------------
-    # Determine output DOCX file name and location
-    # -------------------------------
-    if not args.output_docx:
-        args.output_docx = f"docx_resume_{uuid.uuid4().hex[:8]}.docx"
-    
-    if not os.path.dirname(args.output_docx):
-        exported_folder = "exported_resumes"
-        if not os.path.exists(exported_folder):
-            os.makedirs(exported_folder)
-            if verbose:
-                print(f"Created exported folder: {exported_folder}")
-        args.output_docx = os.path.join(exported_folder, args.output_docx)
-    
     # -------------------------------
     # Backup the original resume file
     # -------------------------------
-    backup_folder = os.path.join("markdown_resumes", "backups")
-    if not os.path.exists(backup_folder):
-        os.makedirs(backup_folder)
-        if verbose:
-            print(f"Created backup folder: {backup_folder}")
+    # Create the markdown folder first so it is reported rather than made silently
+    # as a parent of the backup folder.
+    markdown_folder = Path("markdown_resumes")
+    if ensure_folder(markdown_folder) and verbose:
+        log(f"Created markdown folder: {markdown_folder}")
+    backup_folder = markdown_folder / "backups"
+    if ensure_folder(backup_folder) and verbose:
+        log(f"Created backup folder: {backup_folder}")
     
-    original_filename = os.path.basename(args.resume)
+    original_filename = Path(args.resume).name
     backup_filename = original_filename + ".bak"
-    backup_path = os.path.join(backup_folder, backup_filename)
+    backup_path = backup_folder / backup_filename
     
     # If a backup already exists, append the current date and random letters.
-    if os.path.exists(backup_path):
+    if backup_path.exists():
         now = datetime.datetime.now()
         date_str = now.strftime("%d%m%y")  # DDMMYY format
         random_letters = uuid.uuid4().hex[:5]  # 5 random hexadecimal characters
@@ -255,14 +417,14 @@ def main():
             backup_filename = ".".join(parts[:-1]) + f".{date_str}_{random_letters}." + parts[-1] + ".bak"
         else:
             backup_filename = original_filename + f".{date_str}_{random_letters}.bak"
-        backup_path = os.path.join(backup_folder, backup_filename)
+        backup_path = backup_folder / backup_filename
     
     try:
         shutil.copy(args.resume, backup_path)
         if verbose:
-            print(f"Backup of original resume saved as {backup_path}")
+            log(f"Backup of original resume saved as {backup_path}")
     except Exception as e:
-        print("Error creating backup of the resume:", e)
+        log("Error creating backup of the resume:", e)
         sys.exit(1)
     
     # Load the original resume content.
@@ -270,61 +432,40 @@ def main():
         with open(args.resume, "r", encoding="utf-8") as f:
             resume_md = f.read()
     except Exception as e:
-        print("Error reading the resume file:", e)
-        sys.exit(1)
-    
-    # Fetch job details from the provided URL.
-    if verbose:
-        print("Fetching job details from the URL...")
-    try:
-        job_details = fetch_job_details(args.job_url)
-    except Exception as e:
-        print("Error fetching job details:", e)
+        log("Error reading the resume file:", e)
         sys.exit(1)
-    if verbose:
-        print("Job details fetched successfully.")
-        print("\n--- JOB DETAILS ---")
-        print(job_details)
-        print("-------------------\n")
-    else:
-        print("Job details fetched successfully.")
     
-    # Tailor the resume using OpenAI's API.
-    print("Tailoring the resume to match the job listing...")
-    tailored_resume = tailor_resume(resume_md, job_details, moderate, model=args.model, verbose=verbose)
-    print("Resume tailored successfully.")
+    if not args.batch:
+        tailor_one(args.job_url, resume_md, args)
+        return
     
-    # Save the tailored resume to the specified Markdown file.
+    # Batch mode: tailor every job concurrently. The work is dominated by network
+    # and OpenAI latency, so threads are enough.
     try:
-        with open(args.output_md, "w", encoding="utf-8") as f:
-            f.write(tailored_resume)
-        if verbose:
-            print(f"Tailored resume saved as {args.output_md}")
-        else:
-            print("Tailored resume saved.")
+        with open(args.batch, "r", encoding="utf-8") as f:
+            job_urls = [line.strip() for line in f]
     except Exception as e:
-        print("Error writing tailored resume:", e)
+        log("Error reading the batch file:", e)
         sys.exit(1)
+    job_urls = [url for url in job_urls if url and not url.startswith("#")]
     
-    # Convert the tailored Markdown resume to DOCX using convert_resume.py.
-    convert_script = "convert_resume.py"
-    if not os.path.exists(convert_script):
-        print(f"Error: {convert_script} not found in the current directory.")
-        sys.exit(1)
+    failures = 0
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        futures = [executor.submit(tailor_one, url, resume_md, args, label=url) for url in job_urls]
+        for url, future in zip(job_urls, futures):
+            try:
+                output_md, output_docx = future.result()
+                log(f"{url}: saved {output_md} and {output_docx}")
+            except SystemExit:
+                # tailor_one printed the reason before exiting.
+                log(f"{url}: failed")
+                failures += 1
+            except Exception:
+                log(f"{url}: failed with an unexpected error:\n{traceback.format_exc()}")
+                failures += 1
     
-    print("Converting the tailored resume to DOCX...")
-    try:
-        # Build the conversion command with the --path argument if provided.
-        convert_command = ["python", convert_script, args.output_md, args.output_docx]
-        if args.path:
-            convert_command.extend(["--path", args.path])
-        subprocess.run(convert_command, check=True)
-        if verbose:
-            print(f"Conversion successful. DOCX saved as {args.output_docx}")
-        else:
-            print("Conversion successful.")
-    except subprocess.CalledProcessError as e:
-        print("Error during conversion:", e)
+    log(f"Batch complete: {len(job_urls) - failures} of {len(job_urls)} resumes tailored.")
+    if failures:
         sys.exit(1)
 
 if __name__ == "__main__":